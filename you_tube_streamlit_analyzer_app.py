@@ -1,19 +1,36 @@
 import streamlit as st
 from datetime import datetime, timedelta, timezone
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.model import JsonModel
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+from google.auth.exceptions import GoogleAuthError, RefreshError, TransportError
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+import time
+import random
 import os
+import hashlib
 import json
-import html
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
 
 # --------------------- CONFIG & SCOPE ---------------------
 SCOPES = [
     'https://www.googleapis.com/auth/youtube.readonly',
     'https://www.googleapis.com/auth/yt-analytics.readonly'
 ]
+# Authorized-user token (incl. refresh token) saved after the first OAuth consent
+TOKEN_PATH = os.path.expanduser('~/.yt-analyzer-token.json')
 
 st.set_page_config(page_title="YouTube Realtime & Analytics Analyzer", layout='wide')
 st.title('YouTube Realtime & Analytics Analyzer')
@@ -27,63 +44,392 @@ client_secrets_path = st.sidebar.text_input('OAuth client_secrets.json path (if
 channel_id_input = st.sidebar.text_input('Channel ID (required if not using OAuth)', value='')
 max_results = st.sidebar.slider('Max results per search', min_value=5, max_value=50, value=10)
 poll_interval = st.sidebar.number_input('Poll interval seconds (if using auto-refresh)', min_value=15, max_value=3600, value=60)
+debug_mode = st.sidebar.checkbox('Debug mode (show raw API responses)', value=False)
+cache_ttl = st.sidebar.slider('Reuse realtime API results for (minutes, 0 = off)', min_value=0, max_value=240, value=10) * 60
 
 # Mock defaults when Analytics / OAuth not available
 MOCK_RPM = 2.50
 MOCK_MONETIZATION = "Enabled"
 
+# "Popular" cut-off for the realtime feeds
+POPULAR_MIN_VIEWS = 1000
+
+# Per-call id limits: videos.list takes 50 ids, video-dimension Analytics reports 200 rows
+VIDEOS_LIST_MAX_IDS = 50
+ANALYTICS_MAX_VIDEOS = 200
+
+# Text columns are Arrow-backed (contiguous UTF-8), which st.dataframe sends without
+# converting Python str objects; pyarrow ships with Streamlit
+TEXT_DTYPE = 'string[pyarrow]'
+
+# Partial responses (fields=): only what the parsers below read comes over the wire
+SEARCH_FIELDS = 'items/id/videoId,pageInfo'
+VIDEOS_FIELDS = ('items(id,snippet(title,publishedAt,channelTitle,channelId,thumbnails(high/url,default/url)),'
+                 'statistics(viewCount,likeCount,commentCount))')
+PLAYLIST_ITEMS_FIELDS = 'items/contentDetails(videoId,videoPublishedAt),nextPageToken'
+CHANNEL_FIELDS = ('items(id,snippet/title,statistics(subscriberCount,viewCount,videoCount),status,'
+                  'contentDetails/relatedPlaylists/uploads)')
+
+# Columns of the enriched videos frame built by enrich_videos_with_stats
+VIDEO_COLUMNS = ('videoId', 'title', 'publishedAt', 'channelTitle', 'channelId', 'viewCount', 'likeCount',
+                 'commentCount', 'monetization', 'estimatedRevenue', 'rpm', 'estEarnings', 'thumbnail')
+
+# Independent API round-trips run side by side on a shared pool (see _executor),
+# bounded to respect quota
+MAX_CONCURRENT_REQUESTS = 8
+
+# Cache lifetimes (seconds); realtime searches use the sidebar value instead
+CHANNEL_CACHE_TTL = 24 * 60 * 60
+ANALYTICS_CACHE_TTL = 60 * 60
+# Upper bound for any of the above (sidebar max is 240 min): entries are evicted after
+# this regardless, each caller's own ttl is checked against the stored fetch time
+MAX_CACHE_TTL = CHANNEL_CACHE_TTL
+
+# On-disk HTTP cache: httplib2 stores each GET with its ETag and revalidates
+# with If-None-Match, so unchanged resources come back as a bodiless 304.
+# Only public (API-key) videos.list / channels.list go through it: their URIs repeat,
+# while search/playlistItems URIs change every minute (publishedAfter) and would
+# only pile up files. OAuth/Analytics responses never go to disk. Entries hold the
+# request URI (API key included), so the dir is private and file names are hashed;
+# files older than HTTP_CACHE_MAX_AGE are pruned.
+HTTP_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'yt-analyzer', 'http')
+HTTP_CACHE_MAX_AGE = 24 * 60 * 60
+ETAG_CACHED_METHODS = frozenset({'youtube.videos.list', 'youtube.channels.list'})
+HTTP_TIMEOUT = 10
+
+# Transient failures (429, 5xx, 403 rateLimitExceeded) are retried this many times with
+# exponential backoff + jitter before the error reaches the caller's st.error
+API_RETRIES = 3
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Repeat calls of a throttled fetcher within this many seconds reuse the last result
+MIN_CALL_INTERVAL = 0.15
+
 # --------------------- HELPERS / BUILDERS ---------------------
-def default_published_after():
-    # 3 days ago (UTC) default window
-    return (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+def nullable_ints(values):
+    # API counts arrive as strings (None where hidden): parse the whole column at once to Int64
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype('Int64')
+
+def chunked(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
 
 @st.cache_resource
+def _executor():
+    # process-wide pool; a module-level one would be recreated (and leaked) per rerun
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+
+@st.cache_resource
+def _thread_transports():
+    # per-thread httplib2 transports (httplib2 is not thread-safe); cached so the
+    # same threads find their keep-alive connections again on later reruns
+    return threading.local()
+
+def throttle(key, min_interval=MIN_CALL_INTERVAL):
+    """
+    Collapse rapid repeat clicks: a call with the same arguments within min_interval
+    seconds of the previous `key` call returns that call's result instead of firing
+    another burst at the API (per-minute quota, 429). Nothing sleeps, and the state
+    lives in st.session_state, so sessions never wait on each other.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            last_calls = st.session_state.setdefault('throttle', {})
+            call = (args, kwargs)
+            last = last_calls.get(key)
+            if last and time.monotonic() - last[0] < min_interval and last[1] == call:
+                return last[2]
+            result = fn(*args, **kwargs)
+            last_calls[key] = (time.monotonic(), call, result)
+            return result
+        return wrapper
+    return decorator
+
+def utc_now_minute():
+    # "now" quantized to the minute: request URIs built from it (the cache keys of
+    # execute_request) stay identical for every rerun within that minute
+    return datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+def default_published_after(now=None):
+    now = now or utc_now_minute()
+    # 3 days ago (UTC) default window
+    return (now - timedelta(days=3)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class OrjsonModel(JsonModel):
+    """JsonModel that parses response bodies with orjson; non-JSON bodies go through JsonModel."""
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+def _cache_filename(key):
+    # httplib2's default file name embeds the URI, i.e. the API key
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+@st.cache_resource(ttl=HTTP_CACHE_MAX_AGE)
+def _http_cache():
+    """The ETag FileCache; stale files are pruned each time it is (re)created."""
+    os.makedirs(HTTP_CACHE_DIR, mode=0o700, exist_ok=True)
+    cutoff = time.time() - HTTP_CACHE_MAX_AGE
+    for entry in os.scandir(HTTP_CACHE_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass  # pruned concurrently
+    return httplib2.FileCache(HTTP_CACHE_DIR, safe=_cache_filename)
+
+def new_http(credentials=None):
+    """Uncached httplib2 transport, authorized with credentials if given."""
+    http = httplib2.Http(timeout=HTTP_TIMEOUT)
+    return AuthorizedHttp(credentials, http=http) if credentials else http
+
+def thread_http(credentials=None, etag_cache=False):
+    """
+    The calling thread's pooled transport, authorized with credentials if given.
+    Created once per thread, so keep-alive connections (and their TLS sessions) to
+    googleapis.com are reused by every Data and Analytics call made on that thread.
+    etag_cache selects the HTTP_CACHE_DIR-backed transport (API-key calls only).
+    """
+    transports = _thread_transports()
+    if etag_cache and not credentials:
+        http = getattr(transports, 'cached_http', None)
+        if http is None:
+            http = transports.cached_http = new_http()
+        http.cache = _http_cache()  # picks up the pruned cache once the old one expires
+        return http
+    http = getattr(transports, 'http', None)
+    if http is None:
+        http = transports.http = new_http()
+    return AuthorizedHttp(credentials, http=http) if credentials else http
+
+def request_credentials(request):
+    # OAuth credentials a googleapiclient request was built with (None for API-key clients)
+    return request.http.credentials if isinstance(request.http, AuthorizedHttp) else None
+
+def credentials_cache_key(creds):
+    # Stable per authorized user (survives token refreshes), so cached clients are never
+    # shared between users and aren't rebuilt when the access token changes
+    return (creds.client_id, creds.refresh_token or creds.token)
+
+@st.cache_resource(hash_funcs={Credentials: credentials_cache_key})
 def build_youtube(api_key: str = None, credentials=None):
+    # static_discovery: the discovery docs bundled with the library; cache_discovery=False
+    # skips the discovery-cache lookup that build() would otherwise try first
     if credentials:
-        return build('youtube', 'v3', credentials=credentials)
+        return build('youtube', 'v3', http=new_http(credentials), model=OrjsonModel(),
+                     static_discovery=True, cache_discovery=False)
     elif api_key:
-        return build('youtube', 'v3', developerKey=api_key)
+        return build('youtube', 'v3', developerKey=api_key, http=new_http(), model=OrjsonModel(),
+                     static_discovery=True, cache_discovery=False)
     else:
         return None
 
+@st.cache_resource(hash_funcs={Credentials: credentials_cache_key})
+def build_analytics(credentials):
+    return build('youtubeAnalytics', 'v2', http=new_http(credentials), model=OrjsonModel(),
+                 static_discovery=True, cache_discovery=False)
+
+@st.cache_data(ttl=MAX_CACHE_TTL, max_entries=128, show_spinner=False)
+def _cached_call(key, _fetch):
+    # key identifies the request(s); the fetch time lets cached_fetch apply per-call ttls
+    return time.time(), _fetch()
+
+def cached_fetch(key, ttl, fetch):
+    """fetch() through _cached_call, refetching once the stored response is `ttl` seconds old."""
+    fetched_at, value = _cached_call(key, fetch)
+    if time.time() - fetched_at >= ttl:
+        _cached_call.clear(key, fetch)
+        fetched_at, value = _cached_call(key, fetch)
+    return value
+
+def request_cache_key(request):
+    """Hashable identity of a request: method, URI (incl. API key), body and OAuth user."""
+    creds = request_credentials(request)
+    user = (getattr(creds, 'refresh_token', None) or getattr(creds, 'token', None)) if creds else None
+    return (request.method, request.uri, request.body, user)
+
+def execute_request(request, ttl=None):
+    """
+    Execute a googleapiclient request, reusing an identical response fetched within
+    the last `ttl` seconds (st.cache_data). ttl=None/0 always hits the network.
+    """
+    http = thread_http(request_credentials(request), etag_cache=request.methodId in ETAG_CACHED_METHODS)
+    # num_retries: googleapiclient's own backoff (sleeps rand() * 2**n) on retryable errors
+    if not ttl:
+        return request.execute(http=http, num_retries=API_RETRIES)
+    return cached_fetch(request_cache_key(request), ttl,
+                        lambda: request.execute(http=http, num_retries=API_RETRIES))
+
+def submit_request(request, ttl=None):
+    """
+    Execute a googleapiclient request on the shared pool and return a Future.
+    The call runs over the worker thread's own pooled transport (see thread_http).
+    """
+    ctx = get_script_run_ctx()
+
+    def run():
+        # lets st.cache_data inside execute_request see the session
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return execute_request(request, ttl=ttl)
+
+    return _executor().submit(run)
+
+def _execute_batch_once(service, requests):
+    responses = [None] * len(requests)
+    errors = []
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            errors.append(exception)
+        else:
+            responses[int(request_id)] = response
+
+    batch = service.new_batch_http_request(callback=collect)
+    for i, request in enumerate(requests):
+        batch.add(request, request_id=str(i))
+    batch.execute(http=thread_http(request_credentials(requests[0])))
+    if errors:
+        raise errors[0]
+    return responses
+
+def _execute_batch(service, requests):
+    # BatchHttpRequest has no num_retries: back off and resend the whole batch ourselves
+    for attempt in range(API_RETRIES + 1):
+        try:
+            return _execute_batch_once(service, requests)
+        except HttpError as e:
+            if attempt == API_RETRIES or e.resp.status not in RETRYABLE_STATUSES:
+                raise
+            time.sleep(2 ** attempt + random.random())
+
+def execute_batch(service, requests, ttl=None):
+    """
+    Send several requests for the same API as a single HTTP round-trip (POST /batch)
+    and return their responses in order. Raises the first per-request error.
+    With ttl, the whole batch is cached like execute_request.
+    """
+    if not ttl:
+        return _execute_batch(service, requests)
+    key = tuple(request_cache_key(r) for r in requests)
+    return cached_fetch(key, ttl, lambda: _execute_batch(service, requests))
+
+def save_token(creds):
+    # owner-only: the file holds a refresh token for the YouTube + Analytics scopes
+    fd = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)  # the mode above only applies when the file is created
+    with os.fdopen(fd, 'w') as f:
+        f.write(creds.to_json())
+
+def load_saved_credentials():
+    """
+    Credentials saved by an earlier session, refreshed when expired; None if unusable.
+    A malformed, revoked or non-refreshable token file is removed so it isn't retried.
+    """
+    if not os.path.exists(TOKEN_PATH):
+        return None
+    try:
+        creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+        if creds.valid:
+            return creds
+        if not creds.refresh_token:
+            raise RefreshError('saved token has expired and has no refresh token')
+        creds.refresh(Request())
+    except TransportError as e:
+        # network trouble: the token may still be good, keep it for a later session
+        logger.warning("Could not refresh the saved OAuth token: %s", e)
+        return None
+    except (GoogleAuthError, ValueError) as e:
+        logger.warning("Discarding unusable OAuth token file %s: %s", TOKEN_PATH, e)
+        os.remove(TOKEN_PATH)
+        return None
+    save_token(creds)
+    return creds
+
+@st.cache_resource(show_spinner=False)
 def run_oauth_flow(client_secrets_file):
+    # Cached: the blocking local-server flow runs at most once per process,
+    # and not at all when a saved token can be refreshed. Process-wide, like TOKEN_PATH:
+    # every session of this server gets the same account, so run it locally, single-user
+    if os.path.exists(TOKEN_PATH):
+        creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+        if creds.valid or creds.refresh_token:
+            return creds
+    # imported here: oauthlib/requests-oauthlib are only needed for the consent flow
+    from google_auth_oauthlib.flow import InstalledAppFlow
     flow = InstalledAppFlow.from_client_secrets_file(client_secrets_file, SCOPES)
     creds = flow.run_local_server(port=0)
+    save_token(creds)
+    return creds
+
+def get_oauth_credentials(client_secrets_file):
+    """
+    Return valid OAuth credentials: the cached ones, refreshed with the refresh
+    token when expired; the consent flow re-runs only if the refresh is rejected.
+    """
+    creds = run_oauth_flow(client_secrets_file)
+    if creds.valid:
+        return creds
+    try:
+        creds.refresh(Request())
+    except RefreshError:
+        # revoked or stale token: forget it and ask for consent again
+        run_oauth_flow.clear()
+        if os.path.exists(TOKEN_PATH):
+            os.remove(TOKEN_PATH)
+        return run_oauth_flow(client_secrets_file)
+    save_token(creds)
     return creds
 
 # --------------------- ANALYTICS HELPERS ---------------------
-def fetch_video_analytics_map(analytics, channel_id, video_ids, lookback_days=7):
+def fetch_video_analytics_map(analytics, channel_id, video_ids, lookback_days=7, now=None):
     """
     Returns dict {videoId: {'estimatedRevenue': float, 'views': int, 'rpm': float}}
     Uses Analytics API with dimensions=video and filter video==id1,id2...
+    (one query per ANALYTICS_MAX_VIDEOS ids, run concurrently)
     """
     if not analytics or not channel_id or not video_ids:
         return {}
 
     try:
-        start_date = (datetime.now().date() - timedelta(days=lookback_days)).isoformat()
-        end_date = datetime.now().date().isoformat()
-
-        # Analytics API: query by video dimension
-        res = analytics.reports().query(
-            ids='channel==' + channel_id,
-            startDate=start_date,
-            endDate=end_date,
-            metrics='estimatedRevenue,views',
-            dimensions='video',
-            filters='video==' + ','.join(video_ids)
-        ).execute()
-
-        rows = res.get('rows', []) or []
-        mapping = {}
-        for r in rows:
-            # r example: [videoId, estimatedRevenue, views]
-            vid = r[0]
-            revenue = float(r[1]) if r[1] is not None else 0.0
-            views = int(r[2]) if r[2] is not None else 0
-            rpm = (revenue / views * 1000) if views > 0 else 0
-            mapping[vid] = {'estimatedRevenue': revenue, 'views': views, 'rpm': rpm}
-        return mapping
+        today = (now or utc_now_minute()).date()
+        start_date = (today - timedelta(days=lookback_days)).isoformat()
+        end_date = today.isoformat()
+
+        # Analytics API: one query by video dimension per chunk of ids (a comma-separated
+        # value list is an OR within the filter). Video-dimension reports need an
+        # explicit sort/maxResults, otherwise rows beyond the default page are dropped.
+        futures = [
+            submit_request(analytics.reports().query(
+                ids='channel==' + channel_id,
+                startDate=start_date,
+                endDate=end_date,
+                metrics='estimatedRevenue,views',
+                dimensions='video',
+                filters='video==' + ','.join(chunk),
+                sort='-views',
+                maxResults=len(chunk)
+            ), ttl=ANALYTICS_CACHE_TTL)
+            for chunk in chunked(video_ids, ANALYTICS_MAX_VIDEOS)
+        ]
+
+        rows = [r for future in futures for r in (future.result().get('rows', []) or [])]
+        if not rows:
+            return {}
+        # r example: [videoId, estimatedRevenue, views]; RPM for all rows in one NumPy pass
+        vids = [r[0] for r in rows]
+        revenue = np.array([r[1] if r[1] is not None else 0.0 for r in rows], dtype=np.float64)
+        views = np.array([r[2] if r[2] is not None else 0 for r in rows], dtype=np.int64)
+        rpm = np.where(views > 0, revenue / np.maximum(views, 1) * 1000.0, 0.0)
+        return {
+            vid: {'estimatedRevenue': rev, 'views': v, 'rpm': r}
+            for vid, rev, v, r in zip(vids, revenue.tolist(), views.tolist(), rpm.tolist())
+        }
     except HttpError as e:
         st.warning(f"Analytics API error fetching per-video analytics: {e}")
         return {}
@@ -92,41 +438,76 @@ def fetch_video_analytics_map(analytics, channel_id, video_ids, lookback_days=7)
         return {}
 
 # --------------------- FETCH VIDEOS + MONETIZATION + RPM ---------------------
-def enrich_videos_with_stats(youtube, video_ids, analytics_map=None, use_mock_if_missing=True):
+def videos_frame(cols):
+    """
+    Build the videos DataFrame from per-column lists with explicit dtypes: nullable
+    Int64/Float64 for optional numbers, Arrow-backed text, categorical monetization and
+    tz-aware publishedAt, instead of letting pandas infer object columns.
+    """
+    return pd.DataFrame({
+        'videoId': pd.array(cols['videoId'], dtype=TEXT_DTYPE),
+        'title': pd.array(cols['title'], dtype=TEXT_DTYPE),
+        'publishedAt': pd.to_datetime(cols['publishedAt'], format='ISO8601', utc=True, errors='coerce'),
+        'channelTitle': pd.array(cols['channelTitle'], dtype=TEXT_DTYPE),
+        'channelId': pd.array(cols['channelId'], dtype=TEXT_DTYPE),
+        'viewCount': np.asarray(cols['viewCount'], dtype=np.int64),
+        'likeCount': nullable_ints(cols['likeCount']),
+        'commentCount': nullable_ints(cols['commentCount']),
+        'monetization': pd.Categorical(cols['monetization']),
+        'estimatedRevenue': pd.array(cols['estimatedRevenue'], dtype='Float64'),
+        'rpm': pd.array(cols['rpm'], dtype='Float64'),
+        'estEarnings': pd.array(cols['estEarnings'], dtype='Float64'),
+        'thumbnail': pd.array(cols['thumbnail'], dtype=TEXT_DTYPE),
+    })
+
+def empty_videos_frame():
+    return videos_frame({name: [] for name in VIDEO_COLUMNS})
+
+def submit_videos_list(youtube, video_ids, cache_ttl=None):
+    # videos.list accepts at most 50 ids: one concurrent call per chunk
+    return [
+        submit_request(youtube.videos().list(part='snippet,statistics', id=','.join(chunk),
+                                             fields=VIDEOS_FIELDS), ttl=cache_ttl)
+        for chunk in chunked(video_ids, VIDEOS_LIST_MAX_IDS)
+    ]
+
+def enrich_videos_with_stats(youtube, video_ids, analytics_map=None, use_mock_if_missing=True, videos_futures=None, cache_ttl=None):
     """
-    Given video_ids, call videos().list to get snippet/statistics/status
-    and return list of enriched dicts with monetization, rpm (from analytics_map or mock).
+    Given video_ids, call videos().list to get snippet/statistics
+    and return a DataFrame (VIDEO_COLUMNS) with monetization, rpm (from analytics_map or mock).
+    Pass videos_futures (from submit_videos_list) if the videos.list calls are already in flight.
     """
     if not video_ids:
-        return []
+        return empty_videos_frame()
 
     try:
-        vids_resp = youtube.videos().list(part='snippet,statistics,status', id=','.join(video_ids)).execute()
+        if videos_futures is None:
+            videos_futures = submit_videos_list(youtube, video_ids, cache_ttl=cache_ttl)
+        items = [item for future in videos_futures for item in future.result().get('items', [])]
     except HttpError as e:
         st.error(f"YouTube videos.list error: {e}")
-        return []
+        return empty_videos_frame()
     except Exception as e:
         st.error(f"Unexpected error calling videos.list: {e}")
-        return []
+        return empty_videos_frame()
 
-    rows = []
-    for v in vids_resp.get('items', []):
+    # one list per column (SoA): the frame is built straight from them, no per-row dicts
+    cols = {name: [] for name in VIDEO_COLUMNS}
+    for v in items:
         vid = v.get('id')
         snippet = v.get('snippet', {})
         stats = v.get('statistics', {})
-        status = v.get('status', {})
 
         title = snippet.get('title', '')
         publishedAt = snippet.get('publishedAt', '')
         channel_title = snippet.get('channelTitle', '')
         channel_id = snippet.get('channelId', '')
         view_count = int(stats.get('viewCount', 0))
-        like_count = int(stats.get('likeCount', 0)) if stats.get('likeCount') else None
-        comment_count = int(stats.get('commentCount', 0)) if stats.get('commentCount') else None
+        like_count = stats.get('likeCount')  # absent when the owner hides likes
+        comment_count = stats.get('commentCount')
 
-        monetization_status = status.get('monetizationStatus')
-        if monetization_status is None and use_mock_if_missing:
-            monetization_status = MOCK_MONETIZATION
+        # the Data API exposes no per-video monetization status (VideoStatus has no such field)
+        monetization_status = MOCK_MONETIZATION if use_mock_if_missing else None
 
         # Analytics-based rpm if available, else mock
         rpm = None
@@ -137,135 +518,189 @@ def enrich_videos_with_stats(youtube, video_ids, analytics_map=None, use_mock_if
         else:
             rpm = MOCK_RPM if use_mock_if_missing else None
 
-        # Estimated earnings from RPM: (views / 1000) * rpm
-        est_earnings = round((view_count / 1000.0) * rpm, 2) if rpm is not None else None
-
-        # Thumbnail url
-        thumbnail_url = None
+        # Thumbnail url: the table cell is ~120px wide, so the 120x90 'default' image
+        # (a few KB) is enough; the 480x360 'high' one is only a fallback
         thumbs = snippet.get('thumbnails', {})
-        if 'high' in thumbs:
-            thumbnail_url = thumbs['high'].get('url')
-        elif 'default' in thumbs:
-            thumbnail_url = thumbs['default'].get('url')
-
-        rows.append({
-            'videoId': vid,
-            'title': title,
-            'publishedAt': publishedAt,
-            'channelTitle': channel_title,
-            'channelId': channel_id,
-            'viewCount': view_count,
-            'likeCount': like_count,
-            'commentCount': comment_count,
-            'monetization': monetization_status,
-            'estimatedRevenue': estimatedRevenue,
-            'rpm': rpm,
-            'estEarnings': est_earnings,
-            'thumbnail': thumbnail_url
-        })
-    return rows
+        thumbnail_url = (thumbs.get('default') or thumbs.get('high') or {}).get('url')
+
+        cols['videoId'].append(vid)
+        cols['title'].append(title)
+        cols['publishedAt'].append(publishedAt)
+        cols['channelTitle'].append(channel_title)
+        cols['channelId'].append(channel_id)
+        cols['viewCount'].append(view_count)
+        cols['likeCount'].append(like_count)
+        cols['commentCount'].append(comment_count)
+        cols['monetization'].append(monetization_status)
+        cols['estimatedRevenue'].append(estimatedRevenue)
+        cols['rpm'].append(rpm)
+        cols['thumbnail'].append(thumbnail_url)
+
+    # Estimated earnings from RPM, (views / 1000) * rpm, over whole columns; NA where rpm is
+    rpm_values = pd.array(cols['rpm'], dtype='Float64')
+    cols['estEarnings'] = (np.asarray(cols['viewCount'], dtype=np.int64) / 1000.0 * rpm_values).round(2)
+    return videos_frame(cols)
+
+def fetch_rows_for_ids(youtube, video_ids, analytics=None, channel_id_for_analytics=None, use_mock=True, cache_ttl=None, now=None):
+    """
+    videos.list and the per-video Analytics query are independent: start videos.list
+    on the pool and run the Analytics query meanwhile, so the pair costs ~1 round-trip.
+    """
+    video_ids = list(dict.fromkeys(video_ids))  # paged results can repeat ids
+    videos_futures = submit_videos_list(youtube, video_ids, cache_ttl=cache_ttl)
+
+    analytics_map = {}
+    if analytics and channel_id_for_analytics:
+        analytics_map = fetch_video_analytics_map(analytics, channel_id_for_analytics, video_ids, lookback_days=7, now=now)
+
+    return enrich_videos_with_stats(youtube, video_ids, analytics_map if analytics_map else None,
+                                    use_mock_if_missing=use_mock, videos_futures=videos_futures)
 
-def fetch_recent_videos_full(youtube, published_after_iso, max_results=10, analytics=None, channel_id_for_analytics=None, use_mock=True):
+def parse_rfc3339(value):
+    # YouTube timestamps end in 'Z', which fromisoformat() only accepts from Python 3.11
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def fetch_upload_ids(youtube, uploads_playlist_id, published_after_iso, max_results=10, cache_ttl=None):
+    """
+    Walk a channel's uploads playlist (newest first) and return ids of videos published
+    after 'published_after_iso'. playlistItems.list costs 1 quota unit vs 100 for search.list.
+    """
+    cutoff = parse_rfc3339(published_after_iso)
+    video_ids = []
+    page_token = None
+    while len(video_ids) < max_results:
+        res = execute_request(youtube.playlistItems().list(
+            part='contentDetails',
+            playlistId=uploads_playlist_id,
+            maxResults=50,
+            pageToken=page_token,
+            fields=PLAYLIST_ITEMS_FIELDS
+        ), ttl=cache_ttl)
+        for item in res.get('items', []):
+            details = item.get('contentDetails', {})
+            published = details.get('videoPublishedAt')
+            if not published:
+                continue  # private/deleted uploads carry no publish time
+            if parse_rfc3339(published) < cutoff:
+                return video_ids
+            video_ids.append(details['videoId'])
+            if len(video_ids) >= max_results:
+                break
+        page_token = res.get('nextPageToken')
+        if not page_token:
+            break
+    return video_ids
+
+@throttle('recent_videos')
+def fetch_recent_videos_full(youtube, published_after_iso, max_results=10, analytics=None, channel_id_for_analytics=None, use_mock=True, cache_ttl=None, uploads_playlist_id=None, now=None, debug=False):
     """
-    Search globally for videos published after 'published_after_iso' then enrich with monetization / rpm
+    Find videos published after 'published_after_iso' then enrich with monetization / rpm.
+    With uploads_playlist_id the channel's own uploads are listed (cheap), otherwise YouTube
+    is searched globally. Responses are reused for cache_ttl seconds (see execute_request).
+    debug=True renders the raw responses in the page.
     """
     try:
-        search_response = youtube.search().list(
-            part='snippet',
-            type='video',
-            order='date',
-            publishedAfter=published_after_iso,
-            maxResults=max_results,
-            q='a'  # broad query to increase results
-        ).execute()
-        # debug output (truncated)
-        st.write("Debug: Raw search response (truncated):")
-        try:
-            st.json({k: search_response.get(k) for k in ("kind", "etag", "pageInfo", "items") if k in search_response})
-        except Exception:
-            st.write("Debug: (unable to render JSON)")
+        if uploads_playlist_id:
+            video_ids = fetch_upload_ids(youtube, uploads_playlist_id, published_after_iso, max_results, cache_ttl=cache_ttl)
+        else:
+            # one page: the sidebar caps max_results at search.list's 50-per-page limit
+            search_response = execute_request(youtube.search().list(
+                part='id',  # only ids are read; the snippets come from videos.list
+                type='video',
+                order='date',
+                publishedAfter=published_after_iso,
+                maxResults=max_results,
+                fields=SEARCH_FIELDS
+            ), ttl=cache_ttl)
+            if debug:
+                # debug output (truncated)
+                st.write("Debug: Raw search response (truncated):")
+                try:
+                    st.json({k: search_response.get(k) for k in ("kind", "etag", "pageInfo", "items") if k in search_response})
+                except Exception:
+                    st.write("Debug: (unable to render JSON)")
 
-        video_ids = [item['id']['videoId'] for item in search_response.get('items', []) if 'videoId' in item['id']]
-        st.write(f"Debug: Video IDs found ({len(video_ids)}): {video_ids}")
+            video_ids = [item['id']['videoId'] for item in search_response.get('items', []) if 'videoId' in item['id']]
+        logger.debug("Recent video IDs found (%d): %s", len(video_ids), video_ids)
+        if debug:
+            st.write(f"Debug: Video IDs found ({len(video_ids)}): {video_ids}")
 
         if len(video_ids) == 0:
-            return []
+            return empty_videos_frame()
 
-        analytics_map = {}
-        if analytics and channel_id_for_analytics:
-            analytics_map = fetch_video_analytics_map(analytics, channel_id_for_analytics, video_ids, lookback_days=7)
-
-        rows = enrich_videos_with_stats(youtube, video_ids, analytics_map if analytics_map else None, use_mock_if_missing=use_mock)
-        return rows
+        return fetch_rows_for_ids(youtube, video_ids, analytics, channel_id_for_analytics, use_mock=use_mock, cache_ttl=cache_ttl, now=now)
 
     except HttpError as e:
         if hasattr(e, 'resp') and e.resp.status == 403:
             st.error("YouTube API quota exceeded or access denied.")
         else:
             st.error(f"YouTube API error: {e}")
-        return []
+        return empty_videos_frame()
     except Exception as e:
         st.error(f"Unexpected error fetching recent videos: {e}")
-        return []
+        return empty_videos_frame()
 
-def fetch_today_videos_full(youtube, analytics=None, channel_id_for_analytics=None, max_results_today=50, use_mock=True):
+def fetch_today_videos_full(youtube, analytics=None, channel_id_for_analytics=None, max_results_today=50, use_mock=True, cache_ttl=None, now=None, debug=False):
     """
     Fetch videos published since UTC midnight today AND current live streams (if any),
-    then enrich with monetization + analytics (rpm).
+    then enrich with monetization + analytics (rpm). Responses are reused for cache_ttl seconds.
     """
     try:
-        today_iso = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0).isoformat() + 'Z'
-
-        search_today = youtube.search().list(
-            part='snippet',
-            type='video',
-            order='date',
-            publishedAfter=today_iso,
-            maxResults=max_results_today,
-            q='a'
-        ).execute()
-
-        # also include live videos (currently live)
-        live_search = youtube.search().list(
-            part='snippet',
-            type='video',
-            eventType='live',
-            maxResults=10
-        ).execute()
-
-        video_ids = [item['id']['videoId'] for item in search_today.get('items', []) if 'videoId' in item['id']]
-        for item in live_search.get('items', []):
-            vid = item['id'].get('videoId')
-            if vid and vid not in video_ids:
-                video_ids.append(vid)
-
-        st.write(f"Debug: Today video IDs ({len(video_ids)}): {video_ids}")
+        today_iso = (now or utc_now_minute()).strftime('%Y-%m-%dT00:00:00Z')
+
+        # today's uploads and current live videos go out as one batch HTTP request
+        search_today, live_search = execute_batch(youtube, [
+            youtube.search().list(
+                part='id',
+                type='video',
+                order='date',
+                publishedAfter=today_iso,
+                maxResults=max_results_today,
+                fields=SEARCH_FIELDS
+            ),
+            # also include live videos (currently live)
+            youtube.search().list(
+                part='id',
+                type='video',
+                eventType='live',
+                maxResults=10,
+                fields=SEARCH_FIELDS
+            ),
+        ], ttl=cache_ttl)
+
+        # merge today + live ids, dropping duplicates in O(n) while keeping order
+        items = search_today.get('items', []) + live_search.get('items', [])
+        video_ids = list(dict.fromkeys(item['id']['videoId'] for item in items if item['id'].get('videoId')))
+
+        logger.debug("Today video IDs (%d): %s", len(video_ids), video_ids)
+        if debug:
+            st.write(f"Debug: Today video IDs ({len(video_ids)}): {video_ids}")
 
         if not video_ids:
-            return []
-
-        analytics_map = {}
-        if analytics and channel_id_for_analytics:
-            analytics_map = fetch_video_analytics_map(analytics, channel_id_for_analytics, video_ids, lookback_days=7)
+            return empty_videos_frame()
 
-        rows = enrich_videos_with_stats(youtube, video_ids, analytics_map if analytics_map else None, use_mock_if_missing=use_mock)
-        return rows
+        return fetch_rows_for_ids(youtube, video_ids, analytics, channel_id_for_analytics, use_mock=use_mock, cache_ttl=cache_ttl, now=now)
 
     except HttpError as e:
         st.error(f"YouTube API error: {e}")
-        return []
+        return empty_videos_frame()
     except Exception as e:
         st.error(f"Unexpected error fetching today's videos: {e}")
-        return []
+        return empty_videos_frame()
 
 # --------------------- CHANNEL & MONETIZATION ---------------------
+@throttle('channel_stats')
 def get_channel_stats(youtube, credentials=None, channel_id=None):
     try:
         if credentials:
-            res = youtube.channels().list(part='snippet,statistics,status,contentDetails', mine=True).execute()
+            res = execute_request(youtube.channels().list(part='snippet,statistics,status,contentDetails', mine=True,
+                                                          fields=CHANNEL_FIELDS),
+                                  ttl=CHANNEL_CACHE_TTL)
         else:
             if channel_id:
-                res = youtube.channels().list(part='snippet,statistics,status,contentDetails', id=channel_id).execute()
+                res = execute_request(youtube.channels().list(part='snippet,statistics,status,contentDetails', id=channel_id,
+                                                              fields=CHANNEL_FIELDS),
+                                      ttl=CHANNEL_CACHE_TTL)
             else:
                 st.error('Please provide Channel ID in sidebar if not using OAuth.')
                 return None
@@ -290,38 +725,49 @@ def get_channel_stats(youtube, credentials=None, channel_id=None):
         st.error(f"Unexpected error fetching channel info: {e}")
         return None
 
-def get_channel_monetization_status(youtube):
-    try:
-        res = youtube.channels().list(part='status', mine=True).execute()
-        items = res.get('items', [])
-        if not items:
+def get_authorized_channel(youtube, credentials):
+    """
+    The OAuth user's channel (as returned by get_channel_stats), looked up once per
+    session: its id and uploads playlist don't change, so later clicks skip channels.list.
+    """
+    if 'channel' not in st.session_state:
+        ch = get_channel_stats(youtube, credentials=credentials)
+        if not ch:
             return None
-        return items[0].get('status', {})
-    except HttpError as e:
-        st.error(f"Error fetching channel monetization status: {e}")
-        return None
-    except Exception as e:
-        st.error(f"Unexpected error fetching monetization status: {e}")
-        return None
+        st.session_state['channel'] = ch
+    return st.session_state['channel']
 
-# --------------------- ANALYTICS TIME-SERIES (unchanged) ---------------------
+# --------------------- ANALYTICS TIME-SERIES ---------------------
+@throttle('analytics')
 def fetch_analytics(analytics, channel_id, start_date, end_date):
+    """
+    Daily estimatedRevenue/views/rpm for the channel, one row per date. Responses are
+    reused in memory for ANALYTICS_CACHE_TTL: estimated revenue can still be revised,
+    and per-user revenue shouldn't be written to disk.
+    """
     try:
-        res = analytics.reports().query(
+        request = analytics.reports().query(
             ids='channel==' + channel_id,
             startDate=start_date,
             endDate=end_date,
             metrics='estimatedRevenue,views',
             dimensions='day'
-        ).execute()
+        )
+        res = execute_request(request, ttl=ANALYTICS_CACHE_TTL)
         rows = res.get('rows', []) or []
-        data = []
-        for r in rows:
-            day = r[0]
-            revenue = float(r[1]) if r[1] is not None else 0.0
-            views = int(r[2]) if r[2] is not None else 0
-            data.append({'date': day, 'estimatedRevenue': revenue, 'views': views})
-        return pd.DataFrame(data)
+        if not rows:
+            return pd.DataFrame()
+        # rows are [day, estimatedRevenue, views]: transpose once, then whole-column NumPy
+        # (None -> NaN -> 0) and rpm in the same pass
+        days, revenue, views = zip(*rows)
+        revenue = np.nan_to_num(np.asarray(revenue, dtype=np.float64))
+        views = np.nan_to_num(np.asarray(views, dtype=np.float64)).astype(np.int64)
+        return pd.DataFrame({
+            'date': pd.to_datetime(days, format='%Y-%m-%d'),
+            'estimatedRevenue': revenue,
+            'views': views,
+            'rpm': np.where(views > 0, revenue / np.maximum(views, 1) * 1000.0, 0.0),
+        })
     except HttpError as e:
         st.error(f'Analytics API error: {e}')
         return pd.DataFrame()
@@ -329,91 +775,88 @@ def fetch_analytics(analytics, channel_id, start_date, end_date):
         st.error(f"Unexpected analytics error: {e}")
         return pd.DataFrame()
 
-def compute_rpm(df):
-    df = df.copy()
-    df['rpm'] = df.apply(lambda r: (r['estimatedRevenue'] / r['views'] * 1000) if r['views'] > 0 else 0, axis=1)
-    return df
-
 # --------------------- UI HELPERS ---------------------
-def render_videos_markdown_table(rows):
-    """
-    Build a markdown table with thumbnail images and clickable titles and channel links.
-    Expects list of dicts with keys: thumbnail, title, videoId, channelTitle, channelId, publishedAt, viewCount, rpm, monetization, estEarnings
-    """
-    if not rows:
-        return "No videos to show."
-
-    md = []
-    # header
-    md.append("| Thumbnail | Title | Channel | Published | Views | RPM ($) | Est. Earnings ($) | Monetization |")
-    md.append("|---:|:---|:---|:---|---:|---:|---:|:---|")
-
-    for r in rows:
-        thumb = r.get('thumbnail') or ''
-        thumb_md = f"<img src='{html.escape(thumb)}' width='120' />" if thumb else ""
-        title = html.escape(r.get('title') or '')
-        vid = r.get('videoId')
-        title_md = f"[{title}](https://www.youtube.com/watch?v={vid})" if vid else title
-        channel_title = html.escape(r.get('channelTitle') or '')
-        channel_id = r.get('channelId')
-        channel_md = f"[{channel_title}](https://www.youtube.com/channel/{channel_id})" if channel_id else channel_title
-        published = r.get('publishedAt') or ''
-        try:
-            # shorter published
-            published_s = pd.to_datetime(published).strftime("%Y-%m-%d %H:%M")
-        except Exception:
-            published_s = published
-        views = r.get('viewCount', 0)
-        rpm = r.get('rpm')
-        rpm_s = f"{rpm:.2f}" if isinstance(rpm, (int, float)) else (str(rpm) if rpm is not None else "")
-        est = r.get('estEarnings')
-        est_s = f"{est:.2f}" if isinstance(est, (int, float)) else (str(est) if est is not None else "")
-        monet = r.get('monetization') or ""
-        # compose row
-        md.append(f"| {thumb_md} | {title_md} | {channel_md} | {published_s} | {views} | {rpm_s} | {est_s} | {monet} |")
-
-    return "\n".join(md)
-
-def plot_views_chart_from_rows(rows, title):
-    if not rows:
+def show_videos_table(videos):
+    """
+    Render a videos DataFrame (VIDEO_COLUMNS) with st.dataframe: thumbnails as images,
+    watch/channel URLs as links. The frame goes to the browser as Arrow, no per-row HTML.
+    """
+    if videos is None or videos.empty:
+        st.info("No videos to show.")
+        return
+    table = videos.assign(
+        videoUrl='https://www.youtube.com/watch?v=' + videos['videoId'],
+        channelUrl='https://www.youtube.com/channel/' + videos['channelId'],
+    )
+    st.dataframe(
+        table,
+        column_order=('thumbnail', 'title', 'videoUrl', 'channelTitle', 'channelUrl', 'publishedAt',
+                      'viewCount', 'rpm', 'estEarnings', 'monetization'),
+        column_config={
+            'thumbnail': st.column_config.ImageColumn('Thumbnail'),
+            'title': 'Title',
+            'videoUrl': st.column_config.LinkColumn('Video', display_text='Watch'),
+            'channelTitle': 'Channel',
+            'channelUrl': st.column_config.LinkColumn('Channel page', display_text='Open'),
+            'publishedAt': st.column_config.DatetimeColumn('Published', format='YYYY-MM-DD HH:mm'),
+            'viewCount': st.column_config.NumberColumn('Views'),
+            'rpm': st.column_config.NumberColumn('RPM ($)', format='%.2f'),
+            'estEarnings': st.column_config.NumberColumn('Est. Earnings ($)', format='%.2f'),
+            'monetization': 'Monetization',
+        },
+        hide_index=True,
+        width='stretch',
+    )
+
+def select_popular(videos, min_views=POPULAR_MIN_VIEWS):
+    # The Data API has no view-count filter, so this runs client-side: a single
+    # NumPy comparison over the fetched view counts, no re-fetch per threshold
+    # (viewCount is plain int64, so the mask is a bool ndarray with no NA handling)
+    return videos.loc[videos['viewCount'].to_numpy() >= min_views]
+
+def plot_views_chart(df, title):
+    if df is None or df.empty:
         st.info("No data to plot.")
         return
-    df = pd.DataFrame(rows)
     if 'publishedAt' not in df.columns or 'viewCount' not in df.columns:
         st.info("Insufficient data for chart.")
         return
-    # convert and sort
-    df['publishedAt_dt'] = pd.to_datetime(df['publishedAt'], errors='coerce')
-    df = df.sort_values('publishedAt_dt')
-    plt.figure(figsize=(8, 3.5))
-    plt.plot(df['publishedAt_dt'], df['viewCount'], marker='o')
-    plt.xticks(rotation=35, ha='right')
-    plt.title(title)
-    plt.xlabel('Published')
-    plt.ylabel('Views')
-    plt.tight_layout()
-    st.pyplot(plt)
+    # publishedAt is already tz-aware datetime64 (see videos_frame); rendered client-side
+    st.caption(title)
+    st.line_chart(df.set_index('publishedAt')['viewCount'].sort_index().rename('Views'))
 
 # --------------------- MAIN APP ---------------------
 def main():
     credentials = None
     analytics = None
+    now = utc_now_minute()  # one clock reading per rerun, shared by every fetcher
     youtube_client = None
 
-    # OAuth connect button
+    # OAuth: credentials live in session_state so they survive reruns; a new session
+    # reuses the token saved by an earlier one, so the consent flow is skipped
     if use_oauth:
-        if os.path.exists(client_secrets_path):
+        credentials = st.session_state.get('creds')
+        if credentials is None and 'saved_token_loaded' not in st.session_state:
+            # once per session: a failed load/refresh isn't repeated on every widget interaction
+            st.session_state['saved_token_loaded'] = True
+            credentials = load_saved_credentials()
+        if credentials:
+            st.sidebar.caption('OAuth connected.')
+        elif os.path.exists(client_secrets_path):
             if st.sidebar.button('Connect via OAuth'):
                 try:
-                    credentials = run_oauth_flow(client_secrets_path)
+                    credentials = get_oauth_credentials(client_secrets_path)
+                    st.session_state.pop('channel', None)  # may be a different account
                     st.success('OAuth connected — you can now fetch analytics & monetization.')
-                    # build analytics client now
-                    analytics = build('youtubeAnalytics', 'v2', credentials=credentials)
                 except Exception as e:
                     st.error(f"OAuth flow failed: {e}")
                     credentials = None
         else:
             st.sidebar.warning('client_secrets.json not found at provided path.')
+        if credentials:
+            # expired access tokens are refreshed by AuthorizedHttp before each request
+            st.session_state['creds'] = credentials
+            analytics = build_analytics(credentials)
 
     # Build YouTube client (either with OAuth creds or API key)
     if credentials:
@@ -430,15 +873,16 @@ def main():
         st.header('Realtime / Today Feeds')
         if youtube_client:
             if st.button('Fetch videos published recently'):
-                start_iso = default_published_after()
+                start_iso = default_published_after(now)
 
-                # determine channel id for analytics (if OAuth) or from sidebar
-                channel_id_for_analytics = None
-                if analytics and credentials:
-                    ch_info = get_channel_stats(youtube_client, credentials=credentials)
-                    channel_id_for_analytics = ch_info['id'] if ch_info else None
+                # determine the channel (OAuth or sidebar): its id drives analytics and
+                # its uploads playlist replaces the global search
+                ch_info = None
+                if credentials:
+                    ch_info = get_authorized_channel(youtube_client, credentials)
                 elif channel_id_input:
-                    channel_id_for_analytics = channel_id_input
+                    ch_info = get_channel_stats(youtube_client, channel_id=channel_id_input)
+                channel_id_for_analytics = ch_info['id'] if ch_info else (channel_id_input or None)
 
                 videos = fetch_recent_videos_full(
                     youtube_client,
@@ -446,35 +890,30 @@ def main():
                     max_results=max_results,
                     analytics=analytics,
                     channel_id_for_analytics=channel_id_for_analytics,
-                    use_mock=True
+                    use_mock=True,
+                    cache_ttl=cache_ttl,
+                    uploads_playlist_id=ch_info.get('uploadsPlaylistId') if ch_info else None,
+                    now=now,
+                    debug=debug_mode
                 )
 
-                if not videos:
+                if videos.empty:
                     st.info('No videos found for recent period.')
                 else:
-                    # ensure datetime
-                    for v in videos:
-                        if 'publishedAt' in v:
-                            try:
-                                v['publishedAt'] = pd.to_datetime(v['publishedAt'])
-                            except Exception:
-                                pass
-
                     st.subheader('Recent Videos (with Monetization & RPM if available)')
-                    md = render_videos_markdown_table(videos)
-                    st.markdown(md, unsafe_allow_html=True)
+                    show_videos_table(videos)
 
                     # popular
-                    popular = [v for v in videos if v.get('viewCount', 0) >= 1000]
-                    if popular:
-                        st.subheader('Videos with ≥ 1000 views')
-                        st.markdown(render_videos_markdown_table(popular), unsafe_allow_html=True)
+                    popular = select_popular(videos)
+                    if not popular.empty:
+                        st.subheader(f'Videos with ≥ {POPULAR_MIN_VIEWS} views')
+                        show_videos_table(popular)
                     else:
-                        st.info('No videos have reached 1000+ views yet.')
+                        st.info(f'No videos have reached {POPULAR_MIN_VIEWS}+ views yet.')
 
                     # chart
                     st.subheader('Views over time (Recent Videos)')
-                    plot_views_chart_from_rows(videos, "Recent Videos — Views")
+                    plot_views_chart(videos, "Recent Videos — Views")
         else:
             st.info('API client not ready. Provide API key or OAuth.')
 
@@ -486,18 +925,16 @@ def main():
                 ch = get_channel_stats(youtube_client, credentials=credentials if credentials else None,
                                        channel_id=channel_id_input if not credentials else None)
                 if ch:
+                    if credentials:
+                        # fresh stats for the authorized channel; later lookups reuse them
+                        st.session_state['channel'] = ch
                     st.metric('Subscribers', f"{ch['subscribers']}")
                     st.metric('Channel Views', f"{ch['views']}")
                     st.metric('Total Videos', f"{ch['videos']}")
-                    st.write('Channel status (API raw):')
-                    st.json(ch['status'] if 'status' in ch else {})
-
-                    # show monetization status if OAuth
-                    if credentials:
-                        monet = get_channel_monetization_status(youtube_client)
-                        if monet:
-                            st.subheader('Monetization Status (channel)')
-                            st.json(monet)
+                    # part=status of the same channels.list call; with OAuth it is the
+                    # authorized channel's monetization status, no second request needed
+                    st.subheader('Monetization Status (channel)' if credentials else 'Channel status (API raw)')
+                    st.json(ch['status'])
                 else:
                     st.info('Unable to fetch channel stats. Provide channel ID if not using OAuth.')
         else:
@@ -510,7 +947,7 @@ def main():
             # decide analytics channel id
             channel_id_for_analytics = None
             if analytics and credentials:
-                ch_info = get_channel_stats(youtube_client, credentials=credentials)
+                ch_info = get_authorized_channel(youtube_client, credentials)
                 channel_id_for_analytics = ch_info['id'] if ch_info else None
             elif channel_id_input:
                 channel_id_for_analytics = channel_id_input
@@ -520,17 +957,20 @@ def main():
                 analytics=analytics,
                 channel_id_for_analytics=channel_id_for_analytics,
                 max_results_today=max_results,
-                use_mock=True
+                use_mock=True,
+                cache_ttl=cache_ttl,
+                now=now,
+                debug=debug_mode
             )
 
-            if not today_videos:
+            if today_videos.empty:
                 st.info("No videos or livestreams found for today.")
             else:
                 st.subheader("Today / Live Videos (with Monetization & RPM if available)")
-                st.markdown(render_videos_markdown_table(today_videos), unsafe_allow_html=True)
+                show_videos_table(today_videos)
 
                 st.subheader("Views over time (Today / Live)")
-                plot_views_chart_from_rows(today_videos, "Today / Live — Views")
+                plot_views_chart(today_videos, "Today / Live — Views")
     else:
         st.info('API client not ready. Provide API key or OAuth.')
 
@@ -538,24 +978,16 @@ def main():
     st.header('YouTube Analytics (Estimated Revenue & Views)')
     with st.expander('Analytics chart controls (requires OAuth / analytics permission)'):
         channel_id_analytics = st.text_input('Channel ID for Analytics (leave empty to use authorized channel)', value='')
-        start_date = st.date_input('Start date', value=(datetime.now() - timedelta(days=7)).date())
-        end_date = st.date_input('End date', value=datetime.now().date())
-
-        if analytics is None and credentials:
-            try:
-                analytics = build('youtubeAnalytics', 'v2', credentials=credentials)
-            except Exception as e:
-                st.error(f"Failed to build analytics client: {e}")
-                analytics = None
+        today = now.date()
+        start_date = st.date_input('Start date', value=today - timedelta(days=7))
+        end_date = st.date_input('End date', value=today)
 
         if st.button('Fetch analytics'):
-            channel_id_for_analytics = None
-            if channel_id_analytics:
-                channel_id_for_analytics = channel_id_analytics
-            else:
-                # try to get authorized channel id
+            channel_id_for_analytics = channel_id_analytics
+            if not channel_id_for_analytics:
+                # fall back to the authorized channel
                 if youtube_client and credentials:
-                    chinfo = get_channel_stats(youtube_client, credentials=credentials)
+                    chinfo = get_authorized_channel(youtube_client, credentials)
                     channel_id_for_analytics = chinfo['id'] if chinfo else None
                 elif channel_id_input:
                     channel_id_for_analytics = channel_id_input
@@ -569,40 +1001,28 @@ def main():
                 if df.empty:
                     st.info('No analytics rows returned. Check permission, date range, or account access.')
                 else:
-                    df = compute_rpm(df)
-                    st.dataframe(df)
+                    st.dataframe(df, width='stretch', hide_index=True,
+                                 column_config={'date': st.column_config.DateColumn('date')})
                     avg_rpm = df['rpm'].mean()
                     st.metric(f"Average RPM ({start_date} to {end_date})", f"${avg_rpm:.2f}")
 
-                    # Views chart
-                    fig1 = plt.figure()
-                    plt.plot(pd.to_datetime(df['date']), df['views'])
-                    plt.title('Daily Views')
-                    plt.xlabel('Date')
-                    plt.ylabel('Views')
-                    st.pyplot(fig1)
-
-                    # Revenue chart
-                    fig2 = plt.figure()
-                    plt.plot(pd.to_datetime(df['date']), df['estimatedRevenue'])
-                    plt.title('Estimated Revenue')
-                    plt.xlabel('Date')
-                    plt.ylabel('Revenue')
-                    st.pyplot(fig2)
-
-                    # RPM chart
-                    fig3 = plt.figure()
-                    plt.plot(pd.to_datetime(df['date']), df['rpm'])
-                    plt.title('RPM (estimated)')
-                    plt.xlabel('Date')
-                    plt.ylabel('RPM')
-                    st.pyplot(fig3)
+                    # Native charts: the frame is drawn client-side (Vega-Lite), no server-side PNG rendering
+                    chart_df = df.set_index('date')
+
+                    st.subheader('Daily Views')
+                    st.line_chart(chart_df[['views']])
+
+                    st.subheader('Estimated Revenue')
+                    st.line_chart(chart_df[['estimatedRevenue']])
+
+                    st.subheader('RPM (estimated)')
+                    st.line_chart(chart_df[['rpm']])
 
     # Footer / notes
     with st.expander("Notes: RPM & Monetization"):
         st.markdown("""
         - RPM and Estimated Revenue are fetched from YouTube Analytics (requires OAuth & appropriate access).
-        - Monetization status is returned by the Data API per-video under `status.monetizationStatus` (only for videos accessible to the authenticated account).
+        - The Data API has no per-video monetization status; the video tables show the mock value, and the channel's status comes from `channels.list` (part `status`).
         - If you use only an API key (no OAuth), the app uses mock values: `RPM = $2.50` and `Monetization = "Enabled"`.
         - Analytics queries may return no data for very new videos or channels without revenue.
         - Quotas: be mindful of API quota consumption. Reduce polling frequency or max_results to save quota.